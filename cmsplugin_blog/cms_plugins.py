@@ -16,8 +16,12 @@ class CMSLatestEntriesPlugin(CMSPluginBase):
         """
             Render the latest entries
         """
-        qs = Entry.published.all()
-        
+        # The listing template only needs the publication data; defer the
+        # remaining columns (notably tags) instead of hydrating full rows.
+        # Titles are resolved by the template through the translation
+        # annotations, so with_titles() would only add a wasted query.
+        qs = Entry.published.all().only('id', 'is_published', 'pub_date')
+
         if instance.current_language_only:
             from cms.utils import get_language_from_request
             language = get_language_from_request(context["request"])
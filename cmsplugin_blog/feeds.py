@@ -16,9 +16,11 @@ MULTILINGUAL = 'cmsplugin_blog.middleware.MultilingualBlogEntriesMiddleware' in
 def get_lang_name(lang):
     return _(dict(settings.LANGUAGES)[lang])
 
-def add_current_root(url):
+def add_current_root(url, language=None):
     if MULTILINGUAL and not has_lang_prefix(url):
-        new_root = "/%s" % get_language()
+        # Callers looping over items should pass the language they already
+        # resolved instead of walking the translation thread-local per url.
+        new_root = "/%s" % (language or get_language())
         url = new_root + url
     return url
 
@@ -49,7 +51,7 @@ class EntriesFeed(Feed):
         return add_current_root(reverse('%sblog_archive_index' % self.language_namespace))
 
     def item_link(self, obj):
-        return add_current_root(obj.get_absolute_url())
+        return add_current_root(obj.get_absolute_url(), language=self.language_code)
 
     def description(self, obj):
         if self.any_language:
@@ -7,6 +7,11 @@ from django.db.models.query import QuerySet
 from django.conf import settings
 from django.utils.translation import get_language, ugettext_lazy as _
 
+try:
+    from django.db.models.functions import Now
+except ImportError:
+    Now = None
+
 from cms.utils.placeholder import PlaceholderNoAction
 from cms.utils.urlutils import urljoin
 
@@ -14,21 +19,88 @@ from cms.models import CMSPlugin, Title
 
 import tagging
 from tagging.fields import TagField
+from tagging.models import TaggedItem
+
+from django.contrib.contenttypes import generic
 
 from simple_translation.actions import SimpleTranslationPlaceholderActions
 from djangocms_utils.fields import M2MPlaceholderField
 
-from threadedcomments import ThreadedComment
-from django.contrib.comments.signals import comment_was_posted
-from django.contrib.sites.models import Site
+import logging
+import os
 
-import os 
+logger = logging.getLogger(__name__)
 
 class PublishedEntriesQueryset(QuerySet):
-    
+
+    _bulk_titles = False
+    _bulk_tags = False
+
     def published(self):
+        if Now is not None:
+            # Lets the database evaluate the timestamp, so the generated
+            # query stays stable instead of embedding a fresh parameter
+            # on every call.
+            return self.filter(is_published=True, pub_date__lte=Now())
         return self.filter(is_published=True, pub_date__lte=datetime.datetime.now())
-        
+
+    def with_titles(self):
+        """
+            Bulk-fetches the entry titles with one extra query when the
+            queryset is iterated and caches them on each entry, so that
+            calling get_absolute_url while iterating does not hit the
+            database once per entry.
+        """
+        clone = self._clone()
+        clone._bulk_titles = True
+        return clone
+
+    def with_tags(self):
+        """
+            Bulk-fetches the tags of all entries with one extra query
+            when the queryset is iterated and caches them on each entry,
+            so that Entry.get_tags serves them from memory instead of
+            going through the entry_tags descriptor, which queries per
+            entry.
+        """
+        clone = self._clone()
+        clone._bulk_tags = True
+        return clone
+
+    def iterator(self):
+        if not (self._bulk_titles or self._bulk_tags):
+            for entry in super(PublishedEntriesQueryset, self).iterator():
+                yield entry
+            return
+        entries = list(super(PublishedEntriesQueryset, self).iterator())
+        if entries and self._bulk_titles:
+            titles_by_entry = {}
+            for title in EntryTitle.objects.filter(entry__in=[entry.pk for entry in entries]):
+                titles_by_entry.setdefault(title.entry_id, []).append(title)
+            for entry in entries:
+                entry._title_cache = titles_by_entry.get(entry.pk, [])
+                for title in entry._title_cache:
+                    # Populate the foreign key cache so reversing the
+                    # title urls does not fetch the entry again.
+                    title.entry = entry
+        if entries and self._bulk_tags:
+            from django.contrib.contenttypes.models import ContentType
+            content_type = ContentType.objects.get_for_model(self.model)
+            tags_by_entry = {}
+            for item in TaggedItem.objects.filter(content_type=content_type,
+                    object_id__in=[entry.pk for entry in entries]).select_related('tag'):
+                tags_by_entry.setdefault(item.object_id, []).append(item.tag)
+            for entry in entries:
+                entry._tag_cache = tags_by_entry.get(entry.pk, [])
+        for entry in entries:
+            yield entry
+
+    def _clone(self, *args, **kwargs):
+        clone = super(PublishedEntriesQueryset, self)._clone(*args, **kwargs)
+        clone._bulk_titles = self._bulk_titles
+        clone._bulk_tags = self._bulk_tags
+        return clone
+
 class EntriesManager(models.Manager):
     
     def get_query_set(self):
@@ -40,9 +112,67 @@ class PublishedEntriesManager(EntriesManager):
     """
     def get_query_set(self):
         return super(PublishedEntriesManager, self).get_query_set().published()
+
+class EntryTitlesManager(models.Manager):
+
+    def url_fields(self):
+        """
+            Narrows the titles to the fields needed to reverse their urls
+            and pulls the entry in with the same query, for call sites
+            that build urls in bulk.
+        """
+        return self.get_query_set().only('entry', 'language', 'slug').select_related('entry')
                     
 CMSPLUGIN_BLOG_PLACEHOLDERS = getattr(settings, 'CMSPLUGIN_BLOG_PLACEHOLDERS', ('excerpt', 'content'))
-              
+
+MULTILINGUAL = 'cmsplugin_blog.middleware.MultilingualBlogEntriesMiddleware' in settings.MIDDLEWARE_CLASSES
+
+CMSPLUGIN_BLOG_MOD_CLOSE_AFTER = getattr(settings, 'CMSPLUGIN_BLOG_MOD_CLOSE_AFTER', 7)
+_MOD_CLOSE_DELTA = datetime.timedelta(days=CMSPLUGIN_BLOG_MOD_CLOSE_AFTER)
+
+CMSPLUGIN_BLOG_MODERATE = getattr(settings, 'CMSPLUGIN_BLOG_MODERATE', False)
+# comments_under_moderation has always defaulted to True when the
+# moderation setting is absent, unlike the moderator registration which
+# defaults to off.
+CMSPLUGIN_BLOG_UNDER_MODERATION = getattr(settings, 'CMSPLUGIN_BLOG_MODERATE', True)
+
+CMSPLUGIN_BLOG_EMAIL_FROM = getattr(settings, 'CMSPLUGIN_BLOG_EMAIL_FROM', None)
+
+CMSPLUGIN_BLOG_COMMENT_NOTIFICATIONS = getattr(settings, 'CMSPLUGIN_BLOG_COMMENT_NOTIFICATIONS', False)
+
+CMSPLUGIN_BLOG_SPAM_FILTER = getattr(settings, 'CMSPLUGIN_BLOG_SPAM_FILTER', False)
+
+_blog_prefix_cache = {}
+
+def _blog_prefix(language):
+    """
+        Returns the url prefix of the page the blog apphook is attached to
+        for the given language, falling back to the cms root. The result
+        only changes when a cms Title is edited, so it is cached
+        per-process and invalidated by the Title signals below.
+    """
+    try:
+        return _blog_prefix_cache[language]
+    except KeyError:
+        pass
+    blog_prefix = ''
+    try:
+        title = Title.objects.get(application_urls='BlogApphook', language=language)
+        blog_prefix = urljoin(reverse('pages-root'), title.overwrite_url or title.slug)
+    except Title.DoesNotExist:
+        # Blog app hook not defined anywhere?
+        pass
+    blog_prefix = blog_prefix or reverse('pages-root')
+    _blog_prefix_cache[language] = blog_prefix
+    return blog_prefix
+
+def _clear_blog_prefix_cache(*args, **kwargs):
+    _blog_prefix_cache.clear()
+
+signals.post_save.connect(_clear_blog_prefix_cache, sender=Title)
+signals.post_delete.connect(_clear_blog_prefix_cache, sender=Title)
+
+
 class Entry(models.Model):
     is_published = models.BooleanField(_('is published'))
     pub_date = models.DateTimeField(_('publish at'), default=datetime.datetime.now)
@@ -50,20 +180,49 @@ class Entry(models.Model):
     placeholders = M2MPlaceholderField(actions=SimpleTranslationPlaceholderActions(), placeholders=CMSPLUGIN_BLOG_PLACEHOLDERS)
     
     tags = TagField()
-    
+    tagged_items = generic.GenericRelation(TaggedItem)
+
     objects = EntriesManager()
     published = PublishedEntriesManager()
 
     def get_absolute_url(self, language=None):
         if not language:
             language = get_language()
-        try:
-            url = self.entrytitle_set.get(language=language).get_absolute_url()
-            if url[1:len(language)+1] == language:
-                url = url[len(language)+1:]
-            return url
-        except EntryTitle.DoesNotExist:
+        title = None
+        titles = getattr(self, '_title_cache', None)
+        if titles is None and 'entrytitle_set' in getattr(self, '_prefetched_objects_cache', {}):
+            # Callers on newer Django may have prefetched the titles
+            # themselves; only trust the cache if this relation is in it.
+            titles = self._prefetched_objects_cache['entrytitle_set']
+        if titles is not None:
+            # Entries fetched through with_titles() resolve their url
+            # from the cached titles instead of querying per entry.
+            for entrytitle in titles:
+                if entrytitle.language == language:
+                    title = entrytitle
+                    break
+        else:
+            titles = self.entrytitle_set.filter(language=language)[:1]
+            if titles:
+                title = titles[0]
+        if title is None:
             return ''
+        url = title.get_absolute_url()
+        prefix = '/%s/' % language
+        if url.startswith(prefix):
+            url = url[len(prefix)-1:]
+        return url
+
+    def get_tags(self):
+        """
+            Returns the tags for this entry, served from the cache
+            populated by with_tags() when present instead of querying
+            per entry.
+        """
+        tags = getattr(self, '_tag_cache', None)
+        if tags is not None:
+            return tags
+        return list(self.entry_tags)
 
     def language_changer(self, language):
         url = self.get_absolute_url(language)
@@ -71,17 +230,7 @@ class Entry(models.Model):
             return url
 
         # There is no entry in the given language, we return blog's root
-
-        blog_prefix = ''
-
-        try:
-            title = Title.objects.get(application_urls='BlogApphook', language=language)
-            blog_prefix = urljoin(reverse('pages-root'), title.overwrite_url or title.slug)
-        except Title.DoesNotExist:
-            # Blog app hook not defined anywhere?
-            pass
-
-        return blog_prefix or reverse('pages-root')
+        return _blog_prefix(language)
      
     class Meta:
         verbose_name = _('entry')
@@ -94,7 +243,7 @@ def close_comments_date():
     return datetime.date.today()
 
 def moderate_comments_date():
-    return datetime.date.today() - datetime.timedelta(days=getattr(settings, 'CMSPLUGIN_BLOG_MOD_CLOSE_AFTER', 7))
+    return datetime.date.today() - _MOD_CLOSE_DELTA
 
 class AbstractEntryTitle(models.Model):
     entry = models.ForeignKey(Entry, verbose_name=_('entry'))
@@ -106,15 +255,18 @@ class AbstractEntryTitle(models.Model):
     comments_active = models.BooleanField(_('Activate comments'), help_text=_('If this is disabled comment forms and existing comments won\'t be displayed.'), default=True)
     comments_enabled = models.BooleanField(_('enable comments'), help_text=_('Freeze or unfreeze commenting. Existing comments will be displayed.'), default=True )
 
+    objects = EntryTitlesManager()
+
     def __unicode__(self):
         return self.title
         
     def _get_absolute_url(self):
-        language_namespace = 'cmsplugin_blog.middleware.MultilingualBlogEntriesMiddleware' in settings.MIDDLEWARE_CLASSES and '%s:' % self.language or ''
+        language_namespace = MULTILINGUAL and '%s:' % self.language or ''
+        pub_date = self.entry.pub_date
         return ('%sblog_detail' % language_namespace, (), {
-            'year': self.entry.pub_date.strftime('%Y'),
-            'month': self.entry.pub_date.strftime('%m'),
-            'day': self.entry.pub_date.strftime('%d'),
+            'year': '%04d' % pub_date.year,
+            'month': '%02d' % pub_date.month,
+            'day': '%02d' % pub_date.day,
             'slug': self.slug
         })
     get_absolute_url = models.permalink(_get_absolute_url)
@@ -130,28 +282,26 @@ class AbstractEntryTitle(models.Model):
     pub_date = property(_pub_date)
     
     def close_days(self):
-        pub_date = datetime.date(self.pub_date.year, self.pub_date.month, self.pub_date.day)
-        return (pub_date - datetime.date.today()).days
-        
+        return (self.pub_date.date() - datetime.date.today()).days
+
     def comments_closed(self):
         if not self.comments_enabled:
             return True
-        if self.pub_date < datetime.date.today() or self.close_days() >= getattr(settings, 'CMSPLUGIN_BLOG_MOD_CLOSE_AFTER', 7):
+        today = datetime.date.today()
+        pub_date = self.pub_date.date()
+        if pub_date < today or (pub_date - today).days >= CMSPLUGIN_BLOG_MOD_CLOSE_AFTER:
             return True
         return False
 
     def comments_disabled(self):
-	if not self.comments_active:
-	   return True
-	else:
-	   return False
-    
+        return not self.comments_active
+
+
     def moderate_days(self): # not needed for now remove or leave as hook?
-        pub_date = datetime.date(self.pub_date.year, self.pub_date.month, self.pub_date.day)
-        return (pub_date - datetime.date.today()).days
+        return (self.pub_date.date() - datetime.date.today()).days
             
     def comments_under_moderation(self):
-        return getattr(settings,'CMSPLUGIN_BLOG_MODERATE', True)
+        return CMSPLUGIN_BLOG_UNDER_MODERATION
 
 class EntryTitle(AbstractEntryTitle):
     pass
@@ -165,27 +315,49 @@ class LatestEntriesPlugin(CMSPlugin):
                     
     current_language_only = models.BooleanField(_('Only show entries for the current language'))
 
-from django.contrib.comments.moderation import CommentModerator, moderator
+if CMSPLUGIN_BLOG_MODERATE:
+    from django.contrib.comments.moderation import CommentModerator, moderator
 
-class EntryModerator(CommentModerator):
-    enable_field = 'comments_enabled'
-    auto_close_field = 'pub_date'
-    close_after = getattr(settings, 'CMSPLUGIN_BLOG_MOD_CLOSE_AFTER', 7)
-        
-    def moderate(self, comment, content_object, request):
-        return True
+    class EntryModerator(CommentModerator):
+        enable_field = 'comments_enabled'
+        auto_close_field = 'pub_date'
+        close_after = CMSPLUGIN_BLOG_MOD_CLOSE_AFTER
+
+        def moderate(self, comment, content_object, request):
+            return True
 
-if getattr(settings, 'CMSPLUGIN_BLOG_MODERATE', False):
     moderator.register(EntryTitle, EntryModerator)
 
+_email_replied_templates = {}
+
+def _email_replied_template(suffix):
+    """
+        Parses the reply notification template once per process instead
+        of on every comment posted.
+    """
+    try:
+        return _email_replied_templates[suffix]
+    except KeyError:
+        from django.template.loader import get_template
+        template = get_template(os.path.join(settings.PROJECT_PATH, "templates/cmsplugin_blog/email_replied.%s" % suffix))
+        _email_replied_templates[suffix] = template
+        return template
+
+_default_from_email_cache = []
+
+def _default_from_email():
+    if not _default_from_email_cache:
+        from django.contrib.sites.models import Site
+        _default_from_email_cache.append('noreply@%s' % Site.objects.get_current().domain)
+    return _default_from_email_cache[0]
+
 def on_comment_was_posted_notification(sender, comment, request, *args, **kwargs):
     # Sends a templated email to the origional poster on reply.
     try:
-        from django.core.mail import EmailMultiAlternatives
-        from django.template.loader import get_template
+        from django.core.mail import EmailMultiAlternatives, get_connection
         from django.template import Context
 
-        to = comment.parent.user_email 
+        to = comment.parent.user_email
 
         url = comment.content_object.get_absolute_url
         context_dict = Context({
@@ -195,15 +367,16 @@ def on_comment_was_posted_notification(sender, comment, request, *args, **kwargs
                     'comment': comment.comment,
                     'comment_url': "http://%s%s" % (comment.site, url()),
                        })
+        logger.debug('comment reply notification: %r', context_dict)
 
-        plaintext = get_template(os.path.join(settings.PROJECT_PATH, "templates/cmsplugin_blog/email_replied.txt"))
-        htmly = get_template(os.path.join(settings.PROJECT_PATH, "templates/cmsplugin_blog/email_replied.html"))
-
+        plaintext = _email_replied_template('txt')
+        htmly = _email_replied_template('html')
 
         subject = _('Reply to your comment')
         text_content = plaintext.render(context_dict)
         html_content = htmly.render(context_dict)
-        msg = EmailMultiAlternatives(subject, text_content, getattr(settings,'CMSPLUGIN_BLOG_EMAIL_FROM', 'noreply@%s' % Site.objects.get(pk=settings.SITE_ID).domain), [to])
+        msg = EmailMultiAlternatives(subject, text_content, CMSPLUGIN_BLOG_EMAIL_FROM or _default_from_email(),
+                                     [to], connection=get_connection())
         msg.attach_alternative(html_content, "text/html")
         msg.send()
 
@@ -211,34 +384,54 @@ def on_comment_was_posted_notification(sender, comment, request, *args, **kwargs
         return
 
 
-if getattr(settings, 'CMSPLUGIN_BLOG_COMMENT_NOTIFICATIONS', False):
+if CMSPLUGIN_BLOG_COMMENT_NOTIFICATIONS:
+    from django.contrib.comments.signals import comment_was_posted
     comment_was_posted.connect(on_comment_was_posted_notification)
 
+_akismet_clients = {}
+
+def _get_verified_akismet(key, blog_url, baseurl=None):
+    """
+        Creates an Akismet client and verifies its key once per process,
+        so that only comment_check hits the network per comment. A failed
+        verification is not cached, so the next comment retries instead
+        of disabling the spam check for the life of the process.
+    """
+    try:
+        return _akismet_clients[key]
+    except KeyError:
+        pass
+    from akismet import Akismet
+    ak = Akismet(key=key, blog_url=blog_url)
+    if baseurl:
+        ak.baseurl = baseurl
+    if not ak.verify_key():
+        return None
+    _akismet_clients[key] = ak
+    return ak
+
 def on_comment_was_posted_spamcheck(sender, comment, request, *args, **kwargs):
-    """ 
-        Defines action for django.contrib.comments on_comment_was_posted signal. 
+    """
+        Defines action for django.contrib.comments on_comment_was_posted signal.
         Provides anti-spam via the Akismet and TypePad Antispam services. Both services require the akismet package.
-        Fails silently if the Akismet package is not available. 
+        Fails silently if the Akismet package is not available.
     """
     try:
-        from akismet import Akismet
+        import akismet
     except:
         return
 
+    from django.contrib.sites.models import get_current_site
+    blog_url = 'http://%s/' % get_current_site(request).domain
+
     # use TypePad's AntiSpam if the key is specified in settings.py
     if hasattr(settings, 'TYPEPAD_ANTISPAM_API_KEY'):
-        ak = Akismet(
-            key=settings.TYPEPAD_ANTISPAM_API_KEY,
-            blog_url='http://%s/' % Site.objects.get(pk=settings.SITE_ID).domain
-        )
-        ak.baseurl = 'api.antispam.typepad.com/1.1/'
+        ak = _get_verified_akismet(settings.TYPEPAD_ANTISPAM_API_KEY, blog_url,
+                                   baseurl='api.antispam.typepad.com/1.1/')
     else:
-        ak = Akismet(
-            key=settings.AKISMET_API_KEY,
-            blog_url='http://%s/' % Site.objects.get(pk=settings.SITE_ID).domain
-        )
+        ak = _get_verified_akismet(settings.AKISMET_API_KEY, blog_url)
 
-    if ak.verify_key():
+    if ak:
         data = {
             'user_ip': request.META.get('REMOTE_ADDR', '127.0.0.1'),
             'user_agent': request.META.get('HTTP_USER_AGENT', ''),
@@ -255,5 +448,6 @@ def on_comment_was_posted_spamcheck(sender, comment, request, *args, **kwargs):
             comment.is_public = False
             comment.save()
 
-if getattr(settings, 'CMSPLUGIN_BLOG_SPAM_FILTER', False):
+if CMSPLUGIN_BLOG_SPAM_FILTER:
+    from django.contrib.comments.signals import comment_was_posted
     comment_was_posted.connect(on_comment_was_posted_spamcheck)
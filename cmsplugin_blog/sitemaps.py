@@ -6,7 +6,7 @@ class BlogSitemap(Sitemap):
     priority = 0.5
 
     def items(self):
-        return EntryTitle.objects.filter(entry__is_published=True)
+        return EntryTitle.objects.url_fields().filter(entry__is_published=True)
 
     def lastmod(self, obj):
         return obj.entry.pub_date
\ No newline at end of file
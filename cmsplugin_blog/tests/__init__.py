@@ -2,7 +2,7 @@ import datetime
 from django.core.urlresolvers import reverse
 from django.contrib.auth.models import User
 
-from cmsplugin_blog.models import Entry
+from cmsplugin_blog.models import Entry, _blog_prefix
 from cmsplugin_blog.test.testcases import BaseBlogTestCase
 
 class BlogTestCase(BaseBlogTestCase):
@@ -92,5 +92,20 @@ class BlogTestCase(BaseBlogTestCase):
         
         entry = Entry.objects.get(pk=1)
         self.assertEquals([title.title for title in entry.entrytitle_set.all()], ['english', 'german'])
-        
-        
+
+
+class EntriesQueryCountTestCase(BaseBlogTestCase):
+
+    def test_01_with_titles_bulk_fetches_in_two_queries(self):
+        for i in range(3):
+            self.create_entry_with_title(title='Entry %s' % i, published=True)
+        with self.assertNumQueries(2):
+            entries = list(Entry.published.all().with_titles())
+            for entry in entries:
+                entry.get_absolute_url(language='en')
+
+    def test_02_blog_prefix_is_cached_per_language(self):
+        _blog_prefix('en')
+        with self.assertNumQueries(0):
+            _blog_prefix('en')
+